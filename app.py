@@ -3,12 +3,17 @@ import pandas as pd
 import joblib
 import numpy_financial as npf
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langchain_groq import ChatGroq
 import os
+from applicant_index import FILTER_COLUMNS, build_applicant_index, search_applicants
+from portfolio_aggregates import AGGREGATES_DIR, STATE_FILE, DIMENSIONS, load_aggregates, summarize
+from decision_rules import REJECT_THRESHOLD, CONDITIONAL_THRESHOLD
+from counterfactuals import personalized_recommendation
+from vector_store import load_retriever
+from threshold_evaluation import SWEEP_FILE_PATH, load_sweep, evaluate_thresholds, calibration_report
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -32,10 +37,32 @@ def load_models_and_data():
     
     # Load RAG Components
     embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    vector_db = FAISS.load_local("faiss_index", embedding_model, allow_dangerous_deserialization=True)
+    retriever = load_retriever(embedding_model)
     
     print("Loading complete.")
-    return risk_model, loan_df, vector_db, embedding_model
+    return risk_model, loan_df, retriever, embedding_model
+
+@st.cache_resource
+def load_applicant_index(_loan_df):
+    """Builds the applicant search index once; the leading underscore skips hashing the DataFrame."""
+    return build_applicant_index(_loan_df)
+
+@st.cache_data
+def load_portfolio_summaries(state_mtime):
+    """
+    Reads the small materialized rollup tables written by portfolio_aggregates.py.
+    state_mtime is only a cache key, so the tables are reloaded after each update.
+    """
+    tables, rows_processed = load_aggregates()
+    return {dim: summarize(tables[dim]) for dim in DIMENSIONS}, rows_processed
+
+@st.cache_resource
+def load_threshold_sweep(sweep_mtime):
+    """
+    Loads the compact score sweep written by threshold_evaluation.py.
+    sweep_mtime is only a cache key, so a re-run sweep replaces the cached one.
+    """
+    return load_sweep()
 
 # --- Agent Functions (Copied from loan_processor.py) ---
 # We include the agent logic directly in our app for simplicity.
@@ -46,8 +73,8 @@ def assess_risk(applicant_details, risk_model):
     return risk_probability
 
 def make_decision(risk_probability):
-    if risk_probability > 0.5: return 'Rejected', 'High risk score'
-    elif risk_probability > 0.2: return 'Approved with Conditions', 'Moderate risk score'
+    if risk_probability > REJECT_THRESHOLD: return 'Rejected', 'High risk score'
+    elif risk_probability > CONDITIONAL_THRESHOLD: return 'Approved with Conditions', 'Moderate risk score'
     else: return 'Approved', 'Low risk score'
 
 def calculate_emi(applicant_details, interest_rate=8.5):
@@ -62,26 +89,47 @@ st.title("🤖 RAG-Enabled Loan Application & Risk Assessment System")
 
 # Load all necessary components
 try:
-    risk_model, loan_df, vector_db, embedding_model = load_models_and_data()
+    risk_model, loan_df, retriever, embedding_model = load_models_and_data()
     
     # --- Sidebar for Mode Selection ---
     st.sidebar.title("Select Mode")
     app_mode = st.sidebar.radio(
         "Choose the system's function:",
-        ("Loan Risk Assessment", "Query Documents (RAG)")
+        ("Loan Risk Assessment", "Portfolio", "Threshold Tuning", "Query Documents (RAG)")
     )
 
     if app_mode == "Loan Risk Assessment":
         st.header("Loan Application Risk Assessment")
         
-        # Get a list of applicant IDs to choose from
-        applicant_ids = loan_df['id'].head(100).tolist() # Use first 100 for performance
+        # Search the full loan book server-side and only send one page of IDs to the browser
+        applicant_index = load_applicant_index(loan_df)
+        PAGE_SIZE = 50
+
+        search_cols = st.columns(4)
+        id_prefix = search_cols[0].text_input("Search by Applicant ID:", placeholder="e.g. 6831")
+        filters = {}
+        for col, column in zip(search_cols[1:], FILTER_COLUMNS):
+            options = ["Any"] + [str(label) for label in applicant_index['labels'][column]]
+            choice = col.selectbox(column.replace('_', ' ').title(), options)
+            filters[column] = None if choice == "Any" else choice
+
+        _, _, total_matches = search_applicants(applicant_index, id_prefix, filters, page_size=0)
+        num_pages = max(1, -(-total_matches // PAGE_SIZE))
+        page = st.number_input(f"Page (of {num_pages:,})", min_value=1, max_value=num_pages, value=1) - 1
+        applicant_ids, applicant_rows, _ = search_applicants(applicant_index, id_prefix, filters, page=page, page_size=PAGE_SIZE)
+        st.caption(f"{total_matches:,} matching applicants")
+
+        if not applicant_ids:
+            st.warning("No applicants match this search.")
+            st.stop()
+
+        row_for_id = dict(zip(applicant_ids, applicant_rows))
         selected_id = st.selectbox("Select an Applicant ID to Assess:", applicant_ids)
 
         if st.button("Assess Risk"):
             with st.spinner("Running workflow..."):
                 # --- Run the Agent Workflow ---
-                applicant_details = loan_df[loan_df['id'] == selected_id].iloc[0].to_dict()
+                applicant_details = loan_df.iloc[row_for_id[selected_id]].to_dict()
                 
                 # Agent 3: Risk Assessment
                 risk_prob = assess_risk(applicant_details, risk_model)
@@ -103,15 +151,74 @@ try:
                     st.metric(label="Calculated Risk Probability", value=f"{risk_prob:.2%}")
 
                     # Agent 6: Rejection Report
+                    recommendation = personalized_recommendation(applicant_details, risk_model)
                     st.warning(
+                        f"**Recommendation:** {recommendation}" if recommendation else
                         "**Recommendation:** We recommend improving the applicant's credit score and/or reducing their debt-to-income ratio before reapplying."
                     )
 
+    elif app_mode == "Portfolio":
+        st.header("Portfolio Analytics")
+
+        try:
+            summaries, rows_processed = load_portfolio_summaries(os.path.getmtime(os.path.join(AGGREGATES_DIR, STATE_FILE)))
+        except FileNotFoundError:
+            st.info("No portfolio aggregates found. Run 'python portfolio_aggregates.py' to build them.")
+            st.stop()
+
+        st.caption(f"Aggregates cover {rows_processed:,} loans.")
+        dimension = st.radio("Break down by:", DIMENSIONS, horizontal=True)
+        summary = summaries[dimension]
+
+        st.bar_chart(summary[['default_rate', 'avg_risk_probability']])
+        st.bar_chart(summary[['approved_share', 'conditional_share', 'rejected_share']])
+        st.dataframe(summary.style.format({
+            'loans': '{:,}',
+            'default_rate': '{:.2%}',
+            'avg_risk_probability': '{:.2%}',
+            'approved_share': '{:.2%}',
+            'conditional_share': '{:.2%}',
+            'rejected_share': '{:.2%}',
+        }))
+
+    elif app_mode == "Threshold Tuning":
+        st.header("Decision Threshold Tuning")
+
+        try:
+            sweep = load_threshold_sweep(os.path.getmtime(SWEEP_FILE_PATH))
+        except FileNotFoundError:
+            st.info("No threshold sweep found. Run 'python threshold_evaluation.py' to build it.")
+            st.stop()
+
+        # Both sliders keep a fixed range and key so moving one never resets the other
+        reject_threshold = st.slider("Reject when risk is above:", 0.0, 0.99, REJECT_THRESHOLD, 0.01, key="reject_threshold")
+        conditional_threshold = st.slider("Approve with conditions when risk is above:", 0.0, 0.99, CONDITIONAL_THRESHOLD, 0.01, key="conditional_threshold")
+        if conditional_threshold > reject_threshold:
+            st.caption(f"The conditional cut-off is capped at the reject cut-off ({reject_threshold:.2f}).")
+            conditional_threshold = reject_threshold
+        result = evaluate_thresholds(sweep, reject_threshold, conditional_threshold)
+
+        metric_cols = st.columns(4)
+        metric_cols[0].metric("Approved", f"{result['approved_rate']:.2%}")
+        metric_cols[1].metric("With Conditions", f"{result['conditional_rate']:.2%}")
+        metric_cols[2].metric("Rejected", f"{result['rejected_rate']:.2%}")
+        metric_cols[3].metric("Expected Loss", f"${result['expected_loss']:,.0f}")
+
+        st.subheader("Confusion Matrix (holdout set)")
+        st.dataframe(pd.DataFrame(
+            [[result['true_negatives'], result['false_positives']],
+             [result['false_negatives'], result['true_positives']]],
+            columns=['Predicted Good', 'Predicted Risky'],
+            index=['Actual Good', 'Actual Risky']).astype(int))
+
+        st.subheader(f"Calibration (Brier score: {float(sweep['brier_score']):.4f})")
+        calibration = calibration_report(sweep)
+        st.line_chart(calibration.set_index('bin_high')[['mean_predicted_risk', 'observed_default_rate']])
+
     elif app_mode == "Query Documents (RAG)":
         st.header("Query Loan Documents with RAG")
         
         # Setup RAG chain
-        retriever = vector_db.as_retriever()
         template = "Context: {context}\nQuestion: {question}\nAnswer:"
         prompt = ChatPromptTemplate.from_template(template)
         llm = ChatGroq(model_name="llama3-8b-8192")
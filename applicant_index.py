@@ -0,0 +1,99 @@
+import time
+import numpy as np
+import pandas as pd
+
+# Columns the applicant picker can filter on, in addition to the ID prefix
+FILTER_COLUMNS = ['grade', 'loan_status', 'purpose']
+
+def build_applicant_index(loan_df):
+    """
+    Builds a search index over the applicant IDs in a cleaned loan DataFrame.
+
+    IDs are stored as strings sorted lexicographically, so every ID sharing a
+    prefix sits in one contiguous block that two binary searches can find.
+    The filter columns are stored as small integer codes in the same order, and
+    'rows' maps each entry back to its position in loan_df.
+    """
+    keys = loan_df['id'].astype(str).to_numpy().astype(str)
+    order = np.argsort(keys, kind='stable')
+
+    index = {
+        'keys': keys[order],
+        'ids': loan_df['id'].to_numpy()[order],
+        'rows': order,
+        'codes': {},
+        'labels': {},
+    }
+
+    for column in FILTER_COLUMNS:
+        codes, labels = pd.factorize(loan_df[column], sort=True)
+        # -1 marks missing values, which never match a filter
+        index['codes'][column] = codes[order].astype(np.int16)
+        index['labels'][column] = list(labels)
+
+    return index
+
+def _prefix_range(keys, prefix):
+    """Returns the [start, end) slice of sorted keys that begin with prefix."""
+    if not prefix:
+        return 0, len(keys)
+    start = np.searchsorted(keys, prefix, side='left')
+    # The first string that sorts after every string with this prefix
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    end = np.searchsorted(keys, upper, side='left')
+    return int(start), int(end)
+
+def search_applicants(index, prefix="", filters=None, page=0, page_size=50):
+    """
+    Finds applicants whose ID starts with prefix and who match every filter.
+
+    filters maps a column from FILTER_COLUMNS to the wanted value; None or an
+    empty value means "any". Returns (ids, rows, total_matches) for one page
+    of results, where rows are positions in the DataFrame the index was built on.
+    """
+    start, end = _prefix_range(index['keys'], prefix.strip())
+
+    mask = None
+    for column, value in (filters or {}).items():
+        if value is None or value == "":
+            continue
+        labels = index['labels'][column]
+        if value not in labels:
+            return [], [], 0
+        column_mask = index['codes'][column][start:end] == labels.index(value)
+        mask = column_mask if mask is None else mask & column_mask
+
+    if mask is None:
+        total = end - start
+        page_start = min(start + page * page_size, end)
+        page_end = min(page_start + page_size, end)
+        positions = np.arange(page_start, page_end)
+    else:
+        matches = np.flatnonzero(mask)
+        total = len(matches)
+        positions = start + matches[page * page_size:(page + 1) * page_size]
+
+    return index['ids'][positions].tolist(), index['rows'][positions].tolist(), int(total)
+
+if __name__ == "__main__":
+    print("➡️  Loading applicant IDs and filter columns from dataset/loan.csv...")
+    try:
+        loan_df = pd.read_csv("dataset/loan.csv", usecols=['id'] + FILTER_COLUMNS, low_memory=False)
+        loan_df['id'] = pd.to_numeric(loan_df['id'], errors='coerce')
+        loan_df.dropna(subset=['id'], inplace=True)
+        loan_df['id'] = loan_df['id'].astype(int)
+        loan_df.reset_index(drop=True, inplace=True)
+    except FileNotFoundError:
+        print("🔴 ERROR: The file was not found at dataset/loan.csv")
+        exit()
+
+    start_time = time.perf_counter()
+    index = build_applicant_index(loan_df)
+    print(f"✅ Indexed {len(index['keys']):,} applicants in {time.perf_counter() - start_time:.2f}s.")
+
+    # Time a few typical picker queries
+    for prefix, filters in [("6", None), ("683", None), ("", {'grade': 'A'}), ("68", {'grade': 'C', 'purpose': 'credit_card'})]:
+        start_time = time.perf_counter()
+        ids, rows, total = search_applicants(index, prefix, filters)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        print(f"   prefix={prefix!r} filters={filters}: {total:,} matches, first page of {len(ids)} in {elapsed_ms:.2f} ms")
@@ -38,6 +38,44 @@ def process_and_chunk_documents(extracted_data_path):
 
     return text_chunks
 
+def chunk_documents_with_sources(extracted_data_path):
+    """
+    Chunks each text and JSON file on its own, so every chunk keeps the name
+    of the file it came from. JSON files with a 'pages' list (written by
+    extract_pdf_text.py) are chunked page by page and also keep the page number.
+    Returns (chunks, metadatas) as parallel lists.
+    """
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        length_function=len
+    )
+
+    chunks, metadatas = [], []
+    for filename in sorted(os.listdir(extracted_data_path)):
+        file_path = os.path.join(extracted_data_path, filename)
+
+        if filename.endswith(".json"):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if 'pages' in data:
+                sections = [(page['text'], {'source': filename, 'page': page['page']}) for page in data['pages']]
+            else:
+                sections = [(data.get('text', ""), {'source': filename})]
+        elif filename.endswith(".txt"):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                sections = [(f.read(), {'source': filename})]
+        else:
+            continue
+
+        for text, metadata in sections:
+            for chunk in text_splitter.split_text(text):
+                chunks.append(chunk)
+                metadatas.append(dict(metadata))
+
+    print(f"Created {len(chunks)} text chunks from {len(set(m['source'] for m in metadatas))} documents.")
+    return chunks, metadatas
+
 # --- Main part of the script ---
 # This part only runs if you execute this file directly
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from risk_assessment_model import FEATURES
+from decision_rules import REJECT_THRESHOLD, CONDITIONAL_THRESHOLD, make_decisions
+
+CSV_PATH = "dataset/loan.csv"
+MODEL_FILE_PATH = "risk_model.joblib"
+OUTPUT_PATH = "rejection_reports.csv"
+
+# The outcomes a rejected applicant can aim for, and the risk they must get under
+COUNTERFACTUAL_TARGETS = {
+    'approved_with_conditions': REJECT_THRESHOLD,
+    'approved': CONDITIONAL_THRESHOLD,
+}
+
+# Features an applicant can act on: (direction of change, feasible bound, rounding step)
+ADJUSTABLE_FEATURES = {
+    'fico_range_low': (+1, 850, 1),    # FICO scores top out at 850
+    'dti': (-1, 0, 0.01),              # DTI cannot go below zero
+    'loan_amnt': (-1, 1000, 25),       # Smallest loan amount offered
+}
+
+def compute_counterfactuals(features, risk_model):
+    """
+    Computes, for every row, the single-feature change that brings the risk
+    probability down to each target threshold.
+
+    The logistic model gives risk = sigmoid(w . x + b), so risk <= t exactly
+    when w . x + b <= log(t / (1 - t)). Moving one feature j by delta shifts
+    the margin by w_j * delta, which gives the minimum change in closed form.
+    Targets are rounded in the safe direction; changes that would break a
+    feasible bound, or that the model's weight sign does not allow, are NaN.
+    Returns a DataFrame with a '<feature>_for_<target>' column per combination.
+    """
+    X = features[FEATURES].to_numpy(dtype=float)
+    weights = risk_model.coef_[0]
+    margin = X @ weights + risk_model.intercept_[0]
+
+    result = pd.DataFrame(index=features.index)
+    for target, threshold in COUNTERFACTUAL_TARGETS.items():
+        # A tiny slack keeps floating-point error from landing just above the cut-off
+        target_margin = np.log(threshold / (1 - threshold)) - 1e-9
+        excess = np.maximum(margin - target_margin, 0)
+
+        for column, (direction, bound, step) in ADJUSTABLE_FEATURES.items():
+            j = FEATURES.index(column)
+            current = X[:, j]
+            if np.sign(weights[j]) != -direction:
+                # Moving this feature the feasible way would not reduce risk
+                result[f'{column}_for_{target}'] = np.nan
+                continue
+
+            new_value = current - excess / weights[j]
+            if direction > 0:
+                new_value = np.ceil(new_value / step) * step
+                feasible = new_value <= bound
+            else:
+                new_value = np.floor(new_value / step) * step
+                feasible = new_value >= bound
+            result[f'{column}_for_{target}'] = np.where(feasible, new_value, np.nan)
+
+    return result
+
+def format_recommendation(applicant_details, counterfactual):
+    """Turns one row of counterfactuals into a personalized recommendation."""
+    def options_for(target):
+        options = []
+        fico = counterfactual.get(f'fico_range_low_for_{target}')
+        if pd.notna(fico) and fico > applicant_details['fico_range_low']:
+            options.append(f"raise the FICO score from {applicant_details['fico_range_low']:.0f} to {fico:.0f}")
+        dti = counterfactual.get(f'dti_for_{target}')
+        if pd.notna(dti) and dti < applicant_details['dti']:
+            options.append(f"reduce the debt-to-income ratio from {applicant_details['dti']:.2f} to {dti:.2f}")
+        loan = counterfactual.get(f'loan_amnt_for_{target}')
+        if pd.notna(loan) and loan < applicant_details['loan_amnt']:
+            options.append(f"reduce the loan amount from ${applicant_details['loan_amnt']:,.0f} to ${loan:,.0f}")
+        return options
+
+    conditional_options = options_for('approved_with_conditions')
+    if not conditional_options:
+        return None
+
+    recommendation = "Any one of the following would qualify for approval with conditions: " + "; ".join(conditional_options) + "."
+    approved_options = options_for('approved')
+    if approved_options:
+        recommendation += " For full approval: " + "; ".join(approved_options) + "."
+    return recommendation
+
+def personalized_recommendation(applicant_details, risk_model):
+    """Computes the recommendation for a single applicant, or None if no single change is enough."""
+    features = pd.DataFrame([applicant_details])[FEATURES]
+    counterfactual = compute_counterfactuals(features, risk_model).iloc[0].to_dict()
+    return format_recommendation(applicant_details, counterfactual)
+
+def generate_rejection_recommendations(csv_path=CSV_PATH, model_path=MODEL_FILE_PATH, output_path=OUTPUT_PATH, chunk_size=200000):
+    """
+    Scores the loan book chunk by chunk and writes a personalized path to
+    approval for every rejected applicant. Returns the number of rejections.
+    """
+    risk_model = joblib.load(model_path)
+    chunk_iter = pd.read_csv(csv_path, usecols=['id'] + FEATURES, chunksize=chunk_size, low_memory=False)
+
+    start_time = time.perf_counter()
+    total_rejected = 0
+    for chunk in chunk_iter:
+        chunk = chunk.dropna()
+        if chunk.empty:
+            continue
+        risk = risk_model.predict_proba(chunk[FEATURES])[:, 1]
+        is_rejected = make_decisions(risk) == 'Rejected'
+        rejected = chunk[is_rejected].copy()
+        rejected['risk_probability'] = risk[is_rejected]
+
+        counterfactuals = compute_counterfactuals(rejected, risk_model)
+        report = pd.concat([rejected, counterfactuals], axis=1)
+        report['recommendation'] = [
+            format_recommendation(details, counterfactual)
+            for details, counterfactual in zip(rejected.to_dict('records'), counterfactuals.to_dict('records'))
+        ]
+
+        first_write = total_rejected == 0
+        report.to_csv(output_path, mode='w' if first_write else 'a', header=first_write, index=False)
+        total_rejected += len(report)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"✅ Wrote {total_rejected:,} personalized rejection reports to '{output_path}' in {elapsed:.2f}s.")
+    return total_rejected
+
+if __name__ == "__main__":
+    try:
+        generate_rejection_recommendations()
+    except FileNotFoundError as e:
+        print(f"🔴 ERROR: A required file was not found: {e}")
@@ -5,6 +5,31 @@ import os
 CSV_PATH = "dataset/loan.csv"
 OUTPUT_DIR = "data/extracted_data/text/train"
 
+# Columns we want to keep
+DOCUMENT_COLUMNS = [
+    'id', 'loan_amnt', 'term', 'grade', 'emp_length',
+    'home_ownership', 'annual_inc', 'purpose', 'dti',
+    'fico_range_low', 'loan_status'
+]
+
+def document_path(applicant_id, output_dir):
+    return os.path.join(output_dir, f"loan_app_{int(applicant_id)}.txt")
+
+def write_loan_document(row, output_dir):
+    """Writes the text summary for one loan row."""
+    with open(document_path(row['id'], output_dir), 'w', encoding='utf-8') as f:
+        f.write("--- Loan Application Summary ---\n\n")
+        f.write(f"Application ID: {int(row['id'])}\n")
+        f.write(f"Loan Amount: ${row.get('loan_amnt', 0):,.2f}\n")
+        f.write(f"Loan Term: {row.get('term', 'N/A')}\n")
+        f.write(f"Loan Grade: {row.get('grade', 'N/A')}\n")
+        f.write(f"Employment Length: {row.get('emp_length', 'N/A')}\n")
+        f.write(f"Home Ownership: {row.get('home_ownership', 'N/A')}\n")
+        f.write(f"Annual Income: ${row.get('annual_inc', 0):,.2f}\n")
+        f.write(f"Debt-to-Income Ratio: {row.get('dti', 'N/A')}\n")
+        f.write(f"FICO Score (low): {row.get('fico_range_low', 'N/A')}\n")
+        f.write(f"Loan Status: {row.get('loan_status', 'N/A')}\n")
+
 def create_documents_from_csv_in_chunks(csv_path, output_dir, num_documents=500, chunk_size=100000):
     """
     Reads the large loan CSV in smaller chunks to conserve memory,
@@ -12,17 +37,10 @@ def create_documents_from_csv_in_chunks(csv_path, output_dir, num_documents=500,
     """
     print("➡️  Processing loan data from CSV in memory-efficient chunks...")
     try:
-        # Columns we want to keep
-        columns_to_include = [
-            'id', 'loan_amnt', 'term', 'grade', 'emp_length',
-            'home_ownership', 'annual_inc', 'purpose', 'dti',
-            'fico_range_low', 'loan_status'
-        ]
-        
         # Create an iterator to read the CSV in chunks
         chunk_iter = pd.read_csv(
             csv_path,
-            usecols=columns_to_include,
+            usecols=DOCUMENT_COLUMNS,
             chunksize=chunk_size,
             low_memory=False
         )
@@ -46,22 +64,8 @@ def create_documents_from_csv_in_chunks(csv_path, output_dir, num_documents=500,
             if pd.isna(row['id']):
                 continue
             
-            file_name = f"loan_app_{int(row['id'])}.txt"
-            file_path = os.path.join(output_dir, file_name)
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write("--- Loan Application Summary ---\n\n")
-                f.write(f"Application ID: {int(row['id'])}\n")
-                f.write(f"Loan Amount: ${row.get('loan_amnt', 0):,.2f}\n")
-                f.write(f"Loan Term: {row.get('term', 'N/A')}\n")
-                f.write(f"Loan Grade: {row.get('grade', 'N/A')}\n")
-                f.write(f"Employment Length: {row.get('emp_length', 'N/A')}\n")
-                f.write(f"Home Ownership: {row.get('home_ownership', 'N/A')}\n")
-                f.write(f"Annual Income: ${row.get('annual_inc', 0):,.2f}\n")
-                f.write(f"Debt-to-Income Ratio: {row.get('dti', 'N/A')}\n")
-                f.write(f"FICO Score (low): {row.get('fico_range_low', 'N/A')}\n")
-                f.write(f"Loan Status: {row.get('loan_status', 'N/A')}\n")
-            
+            write_loan_document(row, output_dir)
+
         print(f"✅ Created {len(os.listdir(output_dir))} documents in the '{output_dir}' folder.")
 
     except FileNotFoundError:
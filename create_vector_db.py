@@ -1,5 +1,5 @@
 # We need to import the function that creates our text chunks
-from chunk_documents import process_and_chunk_documents
+from chunk_documents import chunk_documents_with_sources
 
 # Import from the new, recommended package
 from langchain_huggingface import HuggingFaceEmbeddings
@@ -7,22 +7,40 @@ from langchain_huggingface import HuggingFaceEmbeddings
 # We will use FAISS as our vector database
 from langchain_community.vectorstores import FAISS
 
-def create_and_save_vector_db(chunks):
+# Compact copies of the index for large corpora
+from quantized_vector_db import FLOAT_INDEX_PATH, QUANTIZED_INDEX_PATHS, build_quantized_index
+from sharded_vector_db import build_shards
+from vector_store import VECTOR_STORE
+
+def create_and_save_vector_db(chunks, metadatas=None, mode=VECTOR_STORE):
     """
     Creates embeddings for text chunks and saves them to a FAISS vector database.
+    metadatas, if given, is stored with each chunk so answers can cite their
+    source file and page. With mode 'int8' or 'binary' a quantized copy is also
+    written, and with 'sharded' the chunks are split into shards as well, for
+    load_retriever to use instead of the float index.
     """
+    if mode not in ('float', 'sharded') and mode not in QUANTIZED_INDEX_PATHS:
+        raise ValueError(f"Unknown vector store: {mode}")
+    if mode == 'sharded' and metadatas is None:
+        raise ValueError("Sharding needs metadatas with a 'source' for every chunk")
     embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
 
     print("➡️  Creating embeddings for the document chunks...")
     print("⏳ (This may take a few minutes as the model is downloaded for the first time)...")
 
-    vector_db = FAISS.from_texts(texts=chunks, embedding=embedding_model)
+    vector_db = FAISS.from_texts(texts=chunks, embedding=embedding_model, metadatas=metadatas)
 
     print("✅ Embeddings created successfully!")
 
-    vector_db.save_local("faiss_index")
+    vector_db.save_local(FLOAT_INDEX_PATH)
+
+    print(f"✅ Vector database saved to '{FLOAT_INDEX_PATH}' folder.")
 
-    print("✅ Vector database saved to 'faiss_index' folder.")
+    if mode in QUANTIZED_INDEX_PATHS:
+        build_quantized_index(vector_db, QUANTIZED_INDEX_PATHS[mode], mode)
+    elif mode == 'sharded':
+        build_shards(chunks, metadatas, embedding_model)
 
     return vector_db
 
@@ -30,11 +48,11 @@ def create_and_save_vector_db(chunks):
 if __name__ == "__main__":
     # The path to our extracted data folder
     extracted_data_path = "data/extracted_data/text/train"
-    chunks = process_and_chunk_documents(extracted_data_path)
+    chunks, metadatas = chunk_documents_with_sources(extracted_data_path)
 
     # Check if any chunks were created before proceeding
     if chunks:
         # Now, create the vector database from these chunks
-        create_and_save_vector_db(chunks)
+        create_and_save_vector_db(chunks, metadatas)
     else:
         print("⚠️ No chunks were found. Please ensure your 'data/extracted_data/text/train' folder contains text files.")
\ No newline at end of file
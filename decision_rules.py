@@ -0,0 +1,50 @@
+import hashlib
+import numpy as np
+from risk_assessment_model import FEATURES
+
+# Risk probabilities above these cut-offs are rejected / approved with conditions
+REJECT_THRESHOLD = 0.5
+CONDITIONAL_THRESHOLD = 0.2
+DECISION_REASONS = {
+    'Rejected': 'High risk score',
+    'Approved with Conditions': 'Moderate risk score',
+    'Approved': 'Low risk score',
+}
+
+def make_decisions(risk_probabilities):
+    """Applies the make_decision business rules to an array of risk scores at once."""
+    risk_probabilities = np.asarray(risk_probabilities, dtype=float)
+    return np.select(
+        [risk_probabilities > REJECT_THRESHOLD, risk_probabilities > CONDITIONAL_THRESHOLD],
+        ['Rejected', 'Approved with Conditions'],
+        default='Approved'
+    )
+
+def decision_fingerprint(model_path, block_size=1 << 20):
+    """
+    Identifies the model file and thresholds that scores and decisions were made
+    with, so stored results can be thrown away when either changes.
+    """
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return {
+        'model_sha256': digest.hexdigest(),
+        'reject_threshold': REJECT_THRESHOLD,
+        'conditional_threshold': CONDITIONAL_THRESHOLD,
+    }
+
+def score_and_decide(frame, risk_model):
+    """
+    Scores every row of frame that has all model FEATURES and applies the decision rules.
+
+    Returns (risk, decisions, scorable): risk is NaN for rows that could not be
+    scored, and their decision should be ignored in favour of scorable.
+    """
+    features = frame[FEATURES]
+    scorable = features.notna().all(axis=1).to_numpy()
+    risk = np.full(len(features), np.nan)
+    if scorable.any():
+        risk[scorable] = risk_model.predict_proba(features[scorable])[:, 1]
+    return risk, make_decisions(np.nan_to_num(risk)), scorable
@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pypdf import PdfReader
+
+PDF_DIR = "data/extracted_data"
+OUTPUT_DIR = "data/extracted_data/text/train"
+CACHE_DIR = "data/extracted_data/pdf_page_cache"
+
+# Large filings are split into ranges of this many pages, so one long document
+# is spread over several workers instead of holding up a single one
+PAGES_PER_TASK = 25
+
+def file_sha256(path, block_size=1 << 20):
+    """Hashes a file in blocks, so cached pages are invalidated when its content changes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _page_cache_path(cache_dir, file_hash, page_number):
+    return os.path.join(cache_dir, file_hash, f"page_{page_number:05d}.txt")
+
+def _extract_page_range(pdf_path, file_hash, page_numbers, cache_dir):
+    """Worker: extracts the given 1-based pages of one PDF and writes each to the cache."""
+    start_time = time.perf_counter()
+    reader = PdfReader(pdf_path)
+    os.makedirs(os.path.join(cache_dir, file_hash), exist_ok=True)
+
+    for page_number in page_numbers:
+        text = reader.pages[page_number - 1].extract_text() or ""
+        with open(_page_cache_path(cache_dir, file_hash, page_number), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    return pdf_path, len(page_numbers), time.perf_counter() - start_time
+
+def _split_into_ranges(page_numbers, size):
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+
+def extract_pdfs(pdf_dir=PDF_DIR, output_dir=OUTPUT_DIR, cache_dir=CACHE_DIR, max_workers=None):
+    """
+    Extracts text from every PDF in pdf_dir that has no OCR JSON yet.
+
+    Pages already in the cache for the file's current hash are skipped, and
+    the rest are extracted in page ranges across a process pool. Each PDF then
+    becomes '<name>.pdf.json' in output_dir, holding the full text plus a
+    per-page list so the chunker can keep page numbers. PDFs that cannot be
+    read are skipped and returned as a {path: error} dict.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    pdf_files = sorted(f for f in os.listdir(pdf_dir) if f.endswith(".pdf"))
+
+    # --- 1. Work out which pages still need extracting ---
+    jobs = {}
+    failed = {}
+    for filename in pdf_files:
+        stem = filename[:-len(".pdf")]
+        if os.path.exists(os.path.join(output_dir, f"{stem}.json")):
+            continue  # OCR output from download_real_data.py already covers this filing
+
+        pdf_path = os.path.join(pdf_dir, filename)
+        try:
+            file_hash = file_sha256(pdf_path)
+            num_pages = len(PdfReader(pdf_path).pages)
+        except Exception as e:
+            # A corrupt or encrypted filing is skipped rather than stopping the whole run
+            failed[pdf_path] = e
+            continue
+        missing = [page for page in range(1, num_pages + 1)
+                   if not os.path.exists(_page_cache_path(cache_dir, file_hash, page))]
+        jobs[pdf_path] = {'hash': file_hash, 'num_pages': num_pages, 'missing': missing, 'seconds': 0.0}
+
+    pages_to_extract = sum(len(job['missing']) for job in jobs.values())
+    total_pages = sum(job['num_pages'] for job in jobs.values())
+    print(f"➡️  {len(jobs)} PDFs with {total_pages:,} pages; {pages_to_extract:,} pages are not cached yet.")
+
+    # --- 2. Extract the missing pages in parallel ---
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_extract_page_range, pdf_path, job['hash'], page_range, cache_dir): pdf_path
+            for pdf_path, job in jobs.items()
+            for page_range in _split_into_ranges(job['missing'], PAGES_PER_TASK)
+        }
+        for future in as_completed(futures):
+            try:
+                _, _, seconds = future.result()
+                jobs[futures[future]]['seconds'] += seconds
+            except Exception as e:
+                failed.setdefault(futures[future], e)
+    elapsed = time.perf_counter() - start_time
+
+    # --- 3. Assemble one document per PDF from the cache ---
+    for pdf_path, job in jobs.items():
+        if pdf_path in failed:
+            continue
+        output_path = os.path.join(output_dir, os.path.basename(pdf_path)[:-len(".pdf")] + ".pdf.json")
+        if not job['missing'] and os.path.exists(output_path):
+            continue
+
+        pages = []
+        for page_number in range(1, job['num_pages'] + 1):
+            with open(_page_cache_path(cache_dir, job['hash'], page_number), 'r', encoding='utf-8') as f:
+                pages.append({'page': page_number, 'text': f.read()})
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'text': "\n".join(page['text'] for page in pages), 'pages': pages}, f, ensure_ascii=False)
+
+    # --- 4. Report ---
+    print("\n--- Per-file extraction time (worker seconds) ---")
+    for pdf_path, job in jobs.items():
+        if job['missing'] and pdf_path not in failed:
+            print(f"{os.path.basename(pdf_path)}: {len(job['missing'])} pages in {job['seconds']:.2f}s")
+    if pages_to_extract:
+        print(f"\n✅ Extracted {pages_to_extract:,} pages in {elapsed:.2f}s ({pages_to_extract / elapsed:,.1f} pages/s).")
+    print(f"✅ Documents for {sum(1 for pdf_path in jobs if pdf_path not in failed)} PDFs are up to date in '{output_dir}'.")
+    for pdf_path, error in failed.items():
+        print(f"🔴 Skipped {os.path.basename(pdf_path)}: {error}")
+    return failed
+
+if __name__ == "__main__":
+    extract_pdfs()
@@ -0,0 +1,175 @@
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from decision_rules import decision_fingerprint, score_and_decide
+from create_text_files import DOCUMENT_COLUMNS, document_path, write_loan_document
+
+CSV_PATH = "dataset/loan.csv"
+MODEL_FILE_PATH = "risk_model.joblib"
+OUTPUT_DIR = "data/extracted_data/text/train"
+STATE_PATH = "rescoring_state.npz"
+CHANGES_PATH = "rescoring_changes.csv"
+
+# A row only needs rescoring when one of these columns changes
+HASH_COLUMNS = ['loan_amnt', 'annual_inc', 'dti', 'fico_range_low', 'term', 'loan_status']
+NUMERIC_HASH_COLUMNS = ['loan_amnt', 'annual_inc', 'dti', 'fico_range_low']
+
+# Decisions are stored as small integer codes into this list
+DECISIONS = ['Approved', 'Approved with Conditions', 'Rejected', 'Error']
+
+def row_hashes(chunk):
+    """
+    Hashes the model-relevant columns of each row.
+
+    Types are normalized first, so a value hashes the same whether pandas read
+    its column as int, float or object in a particular chunk.
+    """
+    normalized = pd.DataFrame(index=chunk.index)
+    for column in HASH_COLUMNS:
+        if column in NUMERIC_HASH_COLUMNS:
+            normalized[column] = pd.to_numeric(chunk[column], errors='coerce').astype('float64')
+        else:
+            normalized[column] = chunk[column].astype(str).str.strip()
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype=np.uint64)
+
+def load_state(path=STATE_PATH):
+    """
+    Loads the per-row hashes, scores and decisions from the last run, sorted by
+    id, along with the decision_fingerprint they were scored under.
+    """
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+def _fingerprint_matches(state, fingerprint):
+    return all(key in state and state[key].item() == value for key, value in fingerprint.items())
+
+def save_state(state, path=STATE_PATH):
+    np.savez(path, **state)
+
+def _score(chunk, risk_model):
+    """Scores a chunk of rows, returning risk (NaN when features are missing) and decision codes."""
+    risk, decisions, scorable = score_and_decide(chunk, risk_model)
+    codes = np.where(scorable, pd.Series(decisions).map(DECISIONS.index), DECISIONS.index('Error'))
+    return risk, codes.astype(np.int8)
+
+def rescore_snapshot(csv_path=CSV_PATH, model_path=MODEL_FILE_PATH, state_path=STATE_PATH,
+                     output_dir=OUTPUT_DIR, changes_path=CHANGES_PATH, chunk_size=200000):
+    """
+    Diffs a new loan snapshot against the last run in one streaming pass, and
+    rescores and re-decides only new or changed rows.
+
+    Each row's hash of HASH_COLUMNS is looked up by id in the saved state with
+    a binary search. Unchanged rows carry their previous score and decision
+    over. Documents are rewritten only for changed applicants that already
+    have one in output_dir; new applicants are scored and listed in the changes
+    file but do not get a document, so the corpus stays the set chosen by
+    create_text_files.py. Rows whose id disappeared have their documents
+    removed. The first run has no state to compare against: it scores
+    everything and records the baseline without touching any documents.
+
+    Saved scores are only reused if the model file and decision thresholds
+    match the ones recorded with them. Otherwise every row is rescored, as on
+    the first run, and rows whose columns did not change are listed as
+    'rescored' in the changes file.
+    """
+    risk_model = joblib.load(model_path)
+    fingerprint = decision_fingerprint(model_path)
+    try:
+        old = load_state(state_path)
+        print(f"➡️  Comparing against the saved state of {len(old['ids']):,} rows...")
+    except FileNotFoundError:
+        old = None
+        print("➡️  No saved state found; recording a baseline for the whole book...")
+    reuse_scores = old is not None and _fingerprint_matches(old, fingerprint)
+    if old is not None and not reuse_scores:
+        print("⚠️ The model or decision thresholds changed since the last run; rescoring every row...")
+    old_ids = old['ids'] if old is not None else np.array([], dtype=np.int64)
+    seen_old = np.zeros(len(old_ids), dtype=bool)
+
+    chunk_iter = pd.read_csv(csv_path, usecols=DOCUMENT_COLUMNS, chunksize=chunk_size, low_memory=False)
+    os.makedirs(output_dir, exist_ok=True)
+    if os.path.exists(changes_path):
+        os.remove(changes_path)
+
+    start_time = time.perf_counter()
+    new_state = {'ids': [], 'hashes': [], 'risk': [], 'decisions': []}
+    counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'rescored': 0, 'documents': 0}
+    first_change_write = True
+    for chunk in chunk_iter:
+        chunk['id'] = pd.to_numeric(chunk['id'], errors='coerce')
+        chunk = chunk.dropna(subset=['id']).reset_index(drop=True)
+        if chunk.empty:
+            continue
+        ids = chunk['id'].to_numpy(dtype=np.int64)
+        hashes = row_hashes(chunk)
+
+        # --- Diff against the previous snapshot ---
+        if len(old_ids):
+            positions = np.minimum(np.searchsorted(old_ids, ids), len(old_ids) - 1)
+            found = old_ids[positions] == ids
+            same_row = found & (old['hashes'][positions] == hashes)
+            seen_old[positions[found]] = True
+        else:
+            found = same_row = np.zeros(len(ids), dtype=bool)
+        # Scores carried over from a different model or thresholds would be wrong
+        unchanged = same_row if reuse_scores else np.zeros(len(ids), dtype=bool)
+
+        risk = np.full(len(ids), np.nan)
+        decisions = np.full(len(ids), DECISIONS.index('Error'), dtype=np.int8)
+        if unchanged.any():
+            risk[unchanged] = old['risk'][positions[unchanged]]
+            decisions[unchanged] = old['decisions'][positions[unchanged]]
+
+        # --- Rescore and regenerate only what changed ---
+        dirty = ~unchanged
+        if dirty.any():
+            risk[dirty], decisions[dirty] = _score(chunk[dirty], risk_model)
+
+            if old is not None:
+                # Only refresh summaries already in the RAG corpus, so a refresh never grows it
+                for row in chunk[~same_row].to_dict('records'):
+                    if os.path.exists(document_path(row['id'], output_dir)):
+                        write_loan_document(row, output_dir)
+                        counts['documents'] += 1
+
+                changes = pd.DataFrame({
+                    'id': ids[dirty],
+                    'change': np.select([same_row[dirty], found[dirty]], ['rescored', 'changed'], default='new'),
+                    'risk_probability': risk[dirty],
+                    'decision': np.array(DECISIONS)[decisions[dirty]],
+                })
+                changes.to_csv(changes_path, mode='w' if first_change_write else 'a', header=first_change_write, index=False)
+                first_change_write = False
+
+        counts['unchanged'] += int(unchanged.sum())
+        counts['rescored'] += int((same_row & ~unchanged).sum())
+        counts['changed'] += int((found & ~same_row).sum())
+        counts['new'] += int((~found).sum())
+        for key, values in (('ids', ids), ('hashes', hashes), ('risk', risk), ('decisions', decisions)):
+            new_state[key].append(values)
+
+    # --- Remove applicants that are no longer in the book ---
+    deleted_ids = old_ids[~seen_old]
+    for applicant_id in deleted_ids:
+        path = document_path(applicant_id, output_dir)
+        if os.path.exists(path):
+            os.remove(path)
+
+    new_state = {key: np.concatenate(values) if values else np.array([]) for key, values in new_state.items()}
+    order = np.argsort(new_state['ids'], kind='stable')
+    save_state({**{key: values[order] for key, values in new_state.items()}, **fingerprint}, state_path)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"✅ Snapshot processed in {elapsed:.2f}s: {counts['new']:,} new, {counts['changed']:,} changed, "
+          f"{counts['unchanged']:,} unchanged, {counts['rescored']:,} rescored, {len(deleted_ids):,} removed.")
+    if old is not None and not first_change_write:
+        print(f"✅ Rescored rows written to '{changes_path}'; {counts['documents']:,} documents updated in '{output_dir}'.")
+    return counts
+
+if __name__ == "__main__":
+    try:
+        rescore_snapshot()
+    except FileNotFoundError as e:
+        print(f"🔴 ERROR: A required file was not found: {e}")
@@ -1,6 +1,8 @@
 import pandas as pd
 import joblib
 import numpy_financial as npf
+from decision_rules import REJECT_THRESHOLD, CONDITIONAL_THRESHOLD
+from counterfactuals import personalized_recommendation
 
 # --- All the Agent Functions are unchanged ---
 
@@ -50,12 +52,12 @@ def make_decision(risk_probability):
     if risk_probability is None:
         return 'Error', None
 
-    if risk_probability > 0.5:
+    if risk_probability > REJECT_THRESHOLD:
         decision = 'Rejected'
         reason = 'High risk score'
         print(f"-> Decision: {decision} (Reason: {reason})")
         return decision, reason
-    elif risk_probability > 0.2:
+    elif risk_probability > CONDITIONAL_THRESHOLD:
         decision = 'Approved with Conditions'
         reason = 'Moderate risk score'
         print(f"-> Decision: {decision} (Reason: {reason})")
@@ -66,30 +68,41 @@ def make_decision(risk_probability):
         print(f"-> Decision: {decision} (Reason: {reason})")
         return decision, reason
 
+def compute_emi(applicant_details, interest_rate=8.5):
+    """Returns the monthly instalment and term in months, without any logging."""
+    loan_amount = applicant_details['loan_amnt']
+    term_in_months = int(str(applicant_details['term']).strip().split()[0])
+    monthly_rate = (interest_rate / 100) / 12
+    emi = -npf.pmt(rate=monthly_rate, nper=term_in_months, pv=loan_amount)
+    return emi, term_in_months
+
 def calculate_emi(applicant_details, interest_rate=8.5):
     """Generates an EMI schedule if the loan is approved."""
     print(f"\n[Agent 5: EMI Calculation]")
     try:
-        loan_amount = applicant_details['loan_amnt']
-        term_in_months = int(str(applicant_details['term']).strip().split()[0])
-        monthly_rate = (interest_rate / 100) / 12
-        emi = -npf.pmt(rate=monthly_rate, nper=term_in_months, pv=loan_amount)
+        emi, term_in_months = compute_emi(applicant_details, interest_rate)
         print(f"-> Success: Calculated EMI is ${emi:,.2f}/month for {term_in_months} months.")
         return emi
     except Exception as e:
         print(f"-> Error: Could not calculate EMI. Details: {e}")
         return None
 
-def generate_rejection_report(applicant_details, reason):
-    """Provides a rejection reason and recommendations."""
-    print(f"\n[Agent 6: Rejection Report]")
-    report = (
+DEFAULT_RECOMMENDATION = "We recommend improving your credit score and/or reducing your debt-to-income ratio before reapplying."
+
+def build_rejection_report(applicant_details, reason, recommendation=None):
+    """Formats the rejection report text, without any logging."""
+    return (
         f"--- Loan Application Rejection ---\n"
         f"Applicant ID: {applicant_details['id']}\n"
         f"Reason for Rejection: {reason}.\n"
-        f"Recommendation: We recommend improving your credit score and/or reducing your debt-to-income ratio before reapplying."
+        f"Recommendation: {recommendation or DEFAULT_RECOMMENDATION}"
         f"\n----------------------------------"
     )
+
+def generate_rejection_report(applicant_details, reason, recommendation=None):
+    """Provides a rejection reason and recommendations."""
+    print(f"\n[Agent 6: Rejection Report]")
+    report = build_rejection_report(applicant_details, reason, recommendation)
     print(report)
     return report
 
@@ -125,7 +138,9 @@ if __name__ == "__main__":
         
         if decision.startswith('Approved'):
             calculate_emi(details)
+        elif decision == 'Rejected':
+            generate_rejection_report(details, reason, personalized_recommendation(details, risk_model))
         else:
-            generate_rejection_report(details, reason)
+            print(f"\n-> Error: No decision could be made for applicant {APPLICANT_ID_TO_PROCESS}; skipping EMI and rejection report.")
     
     print("\n--- Workflow Complete ---")
\ No newline at end of file
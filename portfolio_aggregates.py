@@ -0,0 +1,205 @@
+import io
+import os
+import json
+import time
+import hashlib
+import joblib
+import numpy as np
+import pandas as pd
+from risk_assessment_model import FEATURES, RISKY_STATUSES
+from decision_rules import decision_fingerprint, score_and_decide
+
+CSV_PATH = "dataset/loan.csv"
+MODEL_FILE_PATH = "risk_model.joblib"
+AGGREGATES_DIR = "portfolio_aggregates"
+STATE_FILE = "state.json"
+
+# The portfolio is rolled up separately along each of these columns
+DIMENSIONS = ['grade', 'purpose', 'term', 'home_ownership']
+
+# Every stored measure is a plain sum, so new rows can simply be added on top
+MEASURES = ['loans', 'defaults', 'scored', 'risk_sum', 'approved', 'approved_with_conditions', 'rejected']
+
+def empty_tables():
+    """Returns one empty rollup table per dimension."""
+    return {dim: pd.DataFrame(columns=MEASURES, dtype=float).rename_axis(dim) for dim in DIMENSIONS}
+
+def _chunk_measures(chunk, risk_model):
+    """Scores one chunk of loans and returns the per-row measures to be summed."""
+    measures = pd.DataFrame(index=chunk.index)
+    measures['loans'] = 1
+    measures['defaults'] = chunk['loan_status'].isin(RISKY_STATUSES).astype(int)
+
+    # Only rows with every model feature present can be scored
+    risk, decisions, scorable = score_and_decide(chunk, risk_model)
+    decisions = pd.Series(decisions, index=chunk.index).where(scorable)
+
+    measures['scored'] = scorable.astype(int)
+    measures['risk_sum'] = np.nan_to_num(risk)
+    measures['approved'] = (decisions == 'Approved').astype(int)
+    measures['approved_with_conditions'] = (decisions == 'Approved with Conditions').astype(int)
+    measures['rejected'] = (decisions == 'Rejected').astype(int)
+    return measures
+
+def apply_rows(tables, chunk, risk_model):
+    """Adds the contribution of a chunk of new loan rows to the rollup tables in place."""
+    measures = _chunk_measures(chunk, risk_model)
+    for dim in DIMENSIONS:
+        keys = chunk[dim].fillna('N/A').astype(str).str.strip()
+        grouped = measures.groupby(keys).sum()
+        tables[dim] = tables[dim].add(grouped, fill_value=0)
+    return tables
+
+def save_aggregates(tables, state, output_dir=AGGREGATES_DIR):
+    """
+    Persists the rollup tables and a state dict describing the CSV prefix they
+    cover ('rows_processed', 'byte_offset', 'prefix_sha256') and the
+    decision_fingerprint they were scored under.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for dim, table in tables.items():
+        table.rename_axis(dim).to_csv(os.path.join(output_dir, f"by_{dim}.csv"))
+    with open(os.path.join(output_dir, STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+def load_state(output_dir=AGGREGATES_DIR):
+    with open(os.path.join(output_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_aggregates(output_dir=AGGREGATES_DIR):
+    """Loads the materialized rollup tables and the number of CSV rows they cover."""
+    rows_processed = load_state(output_dir)['rows_processed']
+    tables = {
+        dim: pd.read_csv(os.path.join(output_dir, f"by_{dim}.csv"), index_col=dim, keep_default_na=False)
+        for dim in DIMENSIONS
+    }
+    return tables, rows_processed
+
+def _hash_prefix(f, digest, num_bytes, block_size=1 << 20):
+    """Feeds the next num_bytes of an open file into digest, returning how many bytes were there."""
+    remaining = num_bytes
+    while remaining > 0:
+        block = f.read(min(block_size, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return num_bytes - remaining
+
+class _HashingReader(io.RawIOBase):
+    """Wraps a binary file so every byte pandas reads from it is also fed into a digest."""
+
+    def __init__(self, f, digest):
+        self._f = f
+        self._digest = digest
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._f.readinto(buffer)
+        self._digest.update(memoryview(buffer)[:n])
+        self.bytes_read += n
+        return n
+
+def _read_new_rows(csv_path, stream, byte_offset, chunk_size):
+    """Yields chunks of the rows from stream, which starts at byte_offset, reusing the header from the top of the file."""
+    usecols = FEATURES + DIMENSIONS + ['loan_status']
+    if not stream.peek(1):
+        return  # Nothing was appended
+    if byte_offset == 0:
+        yield from pd.read_csv(stream, usecols=usecols, chunksize=chunk_size, low_memory=False)
+        return
+
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    yield from pd.read_csv(stream, header=None, names=columns, usecols=usecols, chunksize=chunk_size, low_memory=False)
+
+def summarize(table):
+    """Turns a table of raw sums into default rates, average risk and approval mix."""
+    summary = pd.DataFrame(index=table.index)
+    summary['loans'] = table['loans'].astype(int)
+    summary['default_rate'] = table['defaults'] / table['loans']
+    scored = table['scored'].where(table['scored'] > 0)
+    summary['avg_risk_probability'] = table['risk_sum'] / scored
+    summary['approved_share'] = table['approved'] / scored
+    summary['conditional_share'] = table['approved_with_conditions'] / scored
+    summary['rejected_share'] = table['rejected'] / scored
+    return summary.sort_values('loans', ascending=False)
+
+def update_portfolio_aggregates(csv_path=CSV_PATH, model_path=MODEL_FILE_PATH, output_dir=AGGREGATES_DIR, chunk_size=100000):
+    """
+    Brings the materialized rollups up to date with the loan CSV in one streaming pass.
+
+    The state records how many bytes of the CSV the sums cover and a hash of
+    those bytes. If that prefix is unchanged, only the rows appended after it
+    are read and added. If the file was rewritten, shrunk or edited in place,
+    or the model or decision thresholds changed since the sums were made, they
+    would be wrong, so everything is rebuilt from scratch.
+
+    The file is read only once: a single running hash covers the prefix for
+    the check and then keeps taking in the appended bytes as they are parsed,
+    which gives the hash saved for the next run.
+    """
+    risk_model = joblib.load(model_path)
+    fingerprint = decision_fingerprint(model_path)
+
+    try:
+        state = load_state(output_dir)
+        tables, _ = load_aggregates(output_dir)
+    except FileNotFoundError:
+        state = None
+
+    start_time = time.perf_counter()
+    with open(csv_path, 'rb') as f:
+        digest = hashlib.sha256()
+        prefix_matches = False
+        if state is not None and state.get('byte_offset') is not None:
+            prefix_matches = (
+                _hash_prefix(f, digest, state['byte_offset']) == state['byte_offset']
+                and digest.copy().hexdigest() == state.get('prefix_sha256')
+                and all(state.get(key) == value for key, value in fingerprint.items())
+            )
+
+        if prefix_matches:
+            rows_processed, byte_offset = state['rows_processed'], state['byte_offset']
+            print(f"➡️  Found aggregates covering {rows_processed:,} rows; processing appended rows only...")
+        else:
+            if state is not None:
+                print("⚠️ The loan CSV, model or decision thresholds changed since the last run; rebuilding aggregates from scratch...")
+            else:
+                print("➡️  No aggregates found; building them from scratch...")
+            tables, rows_processed, byte_offset = empty_tables(), 0, 0
+            digest = hashlib.sha256()
+            f.seek(0)
+
+        # Every byte parsed from here on also goes into the running hash
+        reader = _HashingReader(f, digest)
+        stream = io.BufferedReader(reader)
+        new_rows = 0
+        for chunk in _read_new_rows(csv_path, stream, byte_offset, chunk_size):
+            apply_rows(tables, chunk, risk_model)
+            new_rows += len(chunk)
+        while stream.read(1 << 20):
+            pass  # Hash anything the parser left unread, such as a trailing newline
+
+    save_aggregates(tables, {
+        'rows_processed': rows_processed + new_rows,
+        'byte_offset': byte_offset + reader.bytes_read,
+        'prefix_sha256': digest.hexdigest(),
+        **fingerprint,
+    }, output_dir)
+    print(f"✅ Added {new_rows:,} rows in {time.perf_counter() - start_time:.2f}s; "
+          f"aggregates now cover {rows_processed + new_rows:,} rows in '{output_dir}'.")
+    return tables
+
+if __name__ == "__main__":
+    try:
+        tables = update_portfolio_aggregates()
+    except FileNotFoundError as e:
+        print(f"🔴 ERROR: A required file was not found: {e}")
+        exit()
+
+    for dim in DIMENSIONS:
+        print(f"\n--- Portfolio by {dim} ---")
+        print(summarize(tables[dim]).head(10).to_string(float_format=lambda x: f"{x:.3f}"))
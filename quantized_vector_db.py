@@ -0,0 +1,162 @@
+import os
+import time
+import pickle
+import faiss
+import numpy as np
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.runnables import RunnableLambda
+
+FLOAT_INDEX_PATH = "faiss_index"
+QUANTIZED_INDEX_PATHS = {
+    'int8': "faiss_index_int8",
+    'binary': "faiss_index_binary",
+}
+
+# Questions used to measure recall, in the style the RAG chain is asked
+SAMPLE_QUESTIONS = [
+    "What is the loan status for 68407277?",
+    "Which applicants have a debt-to-income ratio above 30?",
+    "What is the annual income of the applicant with a 60 month loan?",
+    "Show me loans with a FICO score below 660.",
+    "Which loans were charged off?",
+    "What grade was given to applicants who rent their home?",
+    "How long has the applicant with the largest loan amount been employed?",
+    "List the loans taken out for debt consolidation.",
+]
+
+def build_quantized_index(vector_db, output_dir, mode='int8'):
+    """
+    Re-encodes the vectors of a float FAISS store as compact codes.
+
+    'int8' keeps one byte per dimension (4x smaller), 'binary' keeps one bit
+    per dimension (32x smaller). The full-precision vectors are written next
+    to the codes as a plain .npy file so searches can re-rank from disk.
+    """
+    n = vector_db.index.ntotal
+    vectors = vector_db.index.reconstruct_n(0, n).astype(np.float32)
+    dim = vectors.shape[1]
+
+    os.makedirs(output_dir, exist_ok=True)
+    if mode == 'int8':
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+        index.train(vectors)
+        index.add(vectors)
+        faiss.write_index(index, os.path.join(output_dir, "index.faiss"))
+    elif mode == 'binary':
+        # Keep only the sign of each dimension; Hamming distance approximates the angle
+        index = faiss.IndexBinaryFlat(dim)
+        index.add(np.packbits(vectors > 0, axis=1))
+        faiss.write_index_binary(index, os.path.join(output_dir, "index.faiss"))
+    else:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+
+    np.save(os.path.join(output_dir, "vectors.npy"), vectors)
+    with open(os.path.join(output_dir, "index.pkl"), 'wb') as f:
+        pickle.dump({
+            'mode': mode,
+            'docstore': vector_db.docstore,
+            'index_to_docstore_id': vector_db.index_to_docstore_id,
+        }, f)
+
+    print(f"✅ Saved {mode} index for {n:,} vectors to '{output_dir}'.")
+
+def load_quantized_index(output_dir):
+    """Loads a quantized store; the float vectors stay on disk behind a memory map."""
+    with open(os.path.join(output_dir, "index.pkl"), 'rb') as f:
+        store = pickle.load(f)
+
+    index_path = os.path.join(output_dir, "index.faiss")
+    if store['mode'] == 'binary':
+        store['index'] = faiss.read_index_binary(index_path)
+    else:
+        store['index'] = faiss.read_index(index_path)
+    store['vectors'] = np.load(os.path.join(output_dir, "vectors.npy"), mmap_mode='r')
+    return store
+
+def index_memory_bytes(index):
+    """Returns the serialized size of a FAISS index, a close proxy for its resident memory."""
+    if isinstance(index, faiss.IndexBinary):
+        return faiss.serialize_index_binary(index).nbytes
+    return faiss.serialize_index(index).nbytes
+
+def quantized_search(store, query_vector, k=4, rerank_factor=10):
+    """
+    Searches the compact codes for k * rerank_factor candidates, then re-ranks
+    them by exact L2 distance against the full-precision vectors.
+    Returns (positions, distances) for the best k.
+    """
+    query_vector = np.asarray(query_vector, dtype=np.float32).reshape(1, -1)
+    num_candidates = min(k * rerank_factor, store['index'].ntotal)
+
+    if store['mode'] == 'binary':
+        _, candidates = store['index'].search(np.packbits(query_vector > 0, axis=1), num_candidates)
+    else:
+        _, candidates = store['index'].search(query_vector, num_candidates)
+    candidates = candidates[0][candidates[0] >= 0]
+
+    # Reading the candidate rows in file order keeps memory-mapped access sequential
+    candidates = np.sort(candidates)
+    exact = np.asarray(store['vectors'][candidates], dtype=np.float32)
+    distances = ((exact - query_vector) ** 2).sum(axis=1)
+    best = np.argsort(distances)[:k]
+    return candidates[best], distances[best]
+
+def quantized_similarity_search(store, embedding_model, query, k=4, rerank_factor=10):
+    """Embeds a question and returns the k most similar documents, like FAISS.similarity_search."""
+    positions, _ = quantized_search(store, embedding_model.embed_query(query), k, rerank_factor)
+    return [store['docstore'].search(store['index_to_docstore_id'][int(i)]) for i in positions]
+
+def quantized_retriever(store, embedding_model, k=4, rerank_factor=10):
+    """Wraps quantized_similarity_search as a runnable that can stand in for vector_db.as_retriever() in a RAG chain."""
+    return RunnableLambda(lambda query: quantized_similarity_search(store, embedding_model, query, k, rerank_factor))
+
+def evaluate_against_float(vector_db, store, query_vectors, k=4, rerank_factor=10):
+    """Reports recall@k, mean latency and index memory of a quantized store against the float index."""
+    query_vectors = np.asarray(query_vectors, dtype=np.float32)
+
+    # Time the float baseline one query at a time, the same way the quantized store is queried
+    truth = []
+    start_time = time.perf_counter()
+    for query_vector in query_vectors:
+        _, neighbours = vector_db.index.search(query_vector.reshape(1, -1), k)
+        truth.append(neighbours[0])
+    float_ms = (time.perf_counter() - start_time) * 1000 / len(query_vectors)
+    truth = np.array(truth)
+
+    hits = 0
+    start_time = time.perf_counter()
+    for query_vector, expected in zip(query_vectors, truth):
+        positions, _ = quantized_search(store, query_vector, k, rerank_factor)
+        hits += len(set(positions.tolist()) & set(expected.tolist()))
+    quantized_ms = (time.perf_counter() - start_time) * 1000 / len(query_vectors)
+
+    float_bytes = index_memory_bytes(vector_db.index)
+    quantized_bytes = index_memory_bytes(store['index'])
+    return {
+        'recall_at_k': hits / truth.size,
+        'float_ms_per_query': float_ms,
+        'quantized_ms_per_query': quantized_ms,
+        'float_index_bytes': float_bytes,
+        'quantized_index_bytes': quantized_bytes,
+        'memory_reduction': float_bytes / quantized_bytes,
+    }
+
+# --- Main execution ---
+if __name__ == "__main__":
+    embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    vector_db = FAISS.load_local(FLOAT_INDEX_PATH, embedding_model, allow_dangerous_deserialization=True)
+
+    # Evaluate on embeddings of real questions, since those are what the RAG chain searches with
+    query_vectors = np.array([embedding_model.embed_query(question) for question in SAMPLE_QUESTIONS], dtype=np.float32)
+
+    for mode, output_dir in QUANTIZED_INDEX_PATHS.items():
+        build_quantized_index(vector_db, output_dir, mode)
+        store = load_quantized_index(output_dir)
+        report = evaluate_against_float(vector_db, store, query_vectors)
+
+        print(f"\n--- {mode} vs float32 ---")
+        print(f"Recall@4: {report['recall_at_k']:.2%}")
+        print(f"Latency: {report['quantized_ms_per_query']:.3f} ms/query (float: {report['float_ms_per_query']:.3f} ms/query)")
+        print(f"Index memory: {report['quantized_index_bytes']:,} bytes "
+              f"(float: {report['float_index_bytes']:,} bytes, {report['memory_reduction']:.1f}x smaller)")
@@ -1,12 +1,13 @@
 import os
 import joblib
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langchain_groq import ChatGroq
+from vector_store import VECTOR_STORE, load_retriever
 
 def list_available_docs(path="data/extracted_data/text/train"):
     """Lists the application IDs from the filenames in the directory."""
@@ -45,9 +46,10 @@ def main():
 
     print("➡️  Loading RAG system...")
     embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    vector_db = FAISS.load_local("faiss_index", embedding_model, allow_dangerous_deserialization=True)
-    retriever = vector_db.as_retriever()
-    print("✅ RAG system loaded.")
+    # Only used to fan a query out over the shards when VECTOR_STORE is 'sharded'
+    search_pool = ThreadPoolExecutor()
+    retriever = load_retriever(embedding_model, executor=search_pool)
+    print(f"✅ RAG system loaded ({VECTOR_STORE} index).")
     
     available_ids = list_available_docs()
     if available_ids:
@@ -126,5 +128,7 @@ def main():
             print("\nAnswer:", answer)
         # --- END OF NEW LOGIC ---
 
+    search_pool.shutdown()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
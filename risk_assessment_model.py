@@ -8,6 +8,17 @@ import joblib # Used to save our trained model
 DATASET_PATH = "dataset/loan.csv"
 MODEL_FILE_PATH = "risk_model.joblib"
 
+# We'll select a few key features for our model
+FEATURES = [
+    'loan_amnt',      # The amount of the loan
+    'annual_inc',     # The borrower's annual income
+    'dti',            # Debt-to-Income ratio
+    'fico_range_low'  # The borrower's FICO credit score
+]
+
+# We consider 'Charged Off', 'Default', etc., as risky.
+RISKY_STATUSES = ['Charged Off', 'Default', 'Does not meet the credit policy. Status:Charged Off', 'Late (31-120 days)']
+
 def train_risk_model(path):
     """
     Loads loan data, preprocesses it, trains a classification model,
@@ -21,13 +32,7 @@ def train_risk_model(path):
         # --- 1. Data Preprocessing and Feature Selection ---
         print("➡️  Preprocessing data...")
         
-        # We'll select a few key features for our model
-        features = [
-            'loan_amnt',      # The amount of the loan
-            'annual_inc',     # The borrower's annual income
-            'dti',            # Debt-to-Income ratio
-            'fico_range_low'  # The borrower's FICO credit score
-        ]
+        features = FEATURES
         
         # The 'loan_status' column is our target variable
         target = 'loan_status'
@@ -39,9 +44,7 @@ def train_risk_model(path):
         model_df.dropna(inplace=True)
         
         # Create our target variable: 1 for risky loans, 0 for good loans
-        # We consider 'Charged Off', 'Default', etc., as risky.
-        risky_statuses = ['Charged Off', 'Default', 'Does not meet the credit policy. Status:Charged Off', 'Late (31-120 days)']
-        model_df['is_risky'] = model_df['loan_status'].isin(risky_statuses).astype(int)
+        model_df['is_risky'] = model_df['loan_status'].isin(RISKY_STATUSES).astype(int)
         
         # Define our features (X) and target (y)
         X = model_df[features]
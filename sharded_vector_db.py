@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import heapq
+import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from chunk_documents import chunk_documents_with_sources
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.runnables import RunnableLambda
+
+SHARDS_DIR = "faiss_shards"
+NUM_SHARDS = 4
+MANIFEST_FILE = "manifest.json"
+
+def shard_for_source(source, num_shards):
+    """Maps a document source to a shard with a stable hash, so a document always lands in the same shard."""
+    return zlib.crc32(source.encode('utf-8')) % num_shards
+
+def _shard_path(shards_dir, shard_id):
+    return os.path.join(shards_dir, f"shard_{shard_id:03d}")
+
+def _group_by_shard(chunks, metadatas, num_shards):
+    """Splits parallel chunk/metadata lists into one (chunks, metadatas) pair per shard."""
+    groups = {}
+    for chunk, metadata in zip(chunks, metadatas):
+        shard_id = shard_for_source(metadata['source'], num_shards)
+        texts, metas = groups.setdefault(shard_id, ([], []))
+        texts.append(chunk)
+        metas.append(metadata)
+    return groups
+
+def read_num_shards(shards_dir=SHARDS_DIR):
+    with open(os.path.join(shards_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)['num_shards']
+
+def build_shards(chunks, metadatas, embedding_model, num_shards=NUM_SHARDS, shards_dir=SHARDS_DIR):
+    """
+    Builds every shard from scratch and records the shard count in a manifest.
+    Any shards from an earlier build are removed first, so none is left with stale contents.
+    """
+    if os.path.exists(shards_dir):
+        shutil.rmtree(shards_dir)
+    os.makedirs(shards_dir, exist_ok=True)
+    with open(os.path.join(shards_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'num_shards': num_shards}, f)
+
+    for shard_id, (texts, metas) in sorted(_group_by_shard(chunks, metadatas, num_shards).items()):
+        FAISS.from_texts(texts=texts, embedding=embedding_model, metadatas=metas).save_local(_shard_path(shards_dir, shard_id))
+        print(f"✅ Shard {shard_id}: {len(texts)} chunks.")
+
+def add_documents_to_shards(chunks, metadatas, embedding_model, shards_dir=SHARDS_DIR):
+    """
+    Adds chunks to their shards, loading and re-saving only the shards they touch.
+    Chunks already stored for the same sources are replaced, so re-adding a document does not duplicate it.
+    """
+    num_shards = read_num_shards(shards_dir)
+    for shard_id, (texts, metas) in sorted(_group_by_shard(chunks, metadatas, num_shards).items()):
+        path = _shard_path(shards_dir, shard_id)
+        if os.path.exists(path):
+            shard = FAISS.load_local(path, embedding_model, allow_dangerous_deserialization=True)
+            sources = {meta['source'] for meta in metas}
+            stale_ids = [doc_id for doc_id in shard.index_to_docstore_id.values()
+                         if shard.docstore.search(doc_id).metadata.get('source') in sources]
+            if stale_ids:
+                shard.delete(stale_ids)
+            shard.add_texts(texts, metadatas=metas)
+        else:
+            shard = FAISS.from_texts(texts=texts, embedding=embedding_model, metadatas=metas)
+        shard.save_local(path)
+        print(f"✅ Added {len(texts)} chunks to shard {shard_id}.")
+
+def rebuild_shard(shard_id, chunks, metadatas, embedding_model, shards_dir=SHARDS_DIR):
+    """Rebuilds a single shard from the chunks that belong to it, leaving the others untouched."""
+    num_shards = read_num_shards(shards_dir)
+    texts, metas = _group_by_shard(chunks, metadatas, num_shards).get(shard_id, ([], []))
+    if not texts:
+        # Drop the old contents, otherwise load_shards would keep searching them
+        shutil.rmtree(_shard_path(shards_dir, shard_id), ignore_errors=True)
+        print(f"⚠️ No chunks belong to shard {shard_id}; removed it.")
+        return
+    FAISS.from_texts(texts=texts, embedding=embedding_model, metadatas=metas).save_local(_shard_path(shards_dir, shard_id))
+    print(f"✅ Rebuilt shard {shard_id} with {len(texts)} chunks.")
+
+def load_shards(embedding_model, shards_dir=SHARDS_DIR):
+    """Loads every shard that has been built."""
+    shards = []
+    for shard_id in range(read_num_shards(shards_dir)):
+        path = _shard_path(shards_dir, shard_id)
+        if os.path.exists(path):
+            shards.append(FAISS.load_local(path, embedding_model, allow_dangerous_deserialization=True))
+    return shards
+
+def sharded_search(shards, embedding_model, query, k=4, executor=None):
+    """
+    Scatters a query to every shard in parallel and gathers the global top-k.
+
+    The query is embedded once. FAISS releases the GIL while searching, so a
+    thread pool searches the shards on separate cores. All shards use the same
+    embedding model and L2 distance, so their scores can be merged directly.
+    Returns (document, distance) pairs, closest first.
+    """
+    query_vector = embedding_model.embed_query(query)
+
+    def search_shard(shard):
+        return shard.similarity_search_with_score_by_vector(query_vector, k=k)
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(shards) or 1) as pool:
+            per_shard = list(pool.map(search_shard, shards))
+    else:
+        per_shard = list(executor.map(search_shard, shards))
+
+    return heapq.nsmallest(k, (hit for hits in per_shard for hit in hits), key=lambda hit: hit[1])
+
+def sharded_retriever(shards, embedding_model, k=4, executor=None):
+    """
+    Wraps sharded_search as a runnable that can stand in for vector_db.as_retriever() in a RAG chain.
+    The caller owns executor and shuts it down; without one, each query uses a short-lived pool.
+    """
+    return RunnableLambda(lambda query: [doc for doc, _ in sharded_search(shards, embedding_model, query, k, executor)])
+
+# --- Main execution ---
+if __name__ == "__main__":
+    extracted_data_path = "data/extracted_data/text/train"
+    chunks, metadatas = chunk_documents_with_sources(extracted_data_path)
+    if not chunks:
+        print(f"⚠️ No chunks were found. Please ensure your '{extracted_data_path}' folder contains text files.")
+        exit()
+
+    embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    print(f"➡️  Building {NUM_SHARDS} shards in '{SHARDS_DIR}'...")
+    build_shards(chunks, metadatas, embedding_model)
+
+    shards = load_shards(embedding_model)
+    question = "What is the loan status for 68407277?"
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        start_time = time.perf_counter()
+        results = sharded_search(shards, embedding_model, question, executor=pool)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    print(f"\n--- Top {len(results)} results across {len(shards)} shards ({elapsed_ms:.1f} ms) ---")
+    for doc, score in results:
+        print(f"[{doc.metadata['source']}] distance={score:.4f}: {doc.page_content[:80]!r}")
@@ -0,0 +1,162 @@
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from risk_assessment_model import FEATURES, RISKY_STATUSES
+from decision_rules import REJECT_THRESHOLD, CONDITIONAL_THRESHOLD
+
+DATASET_PATH = "dataset/loan.csv"
+MODEL_FILE_PATH = "risk_model.joblib"
+SWEEP_FILE_PATH = "threshold_sweep.npz"
+THRESHOLD_REPORT_PATH = "threshold_report.csv"
+CALIBRATION_REPORT_PATH = "calibration_report.csv"
+
+# Share of the loan amount lost when a loan defaults; 1.0 counts the full amount
+LOSS_GIVEN_DEFAULT = 1.0
+# Scores are bucketed to this resolution, which bounds the size of the sweep
+SCORE_RESOLUTION = 1e-4
+
+def score_holdout(path=DATASET_PATH, model_path=MODEL_FILE_PATH):
+    """
+    Rebuilds the 20% test split used by train_risk_model and scores it once.
+    Returns (risk_probabilities, is_risky, loan_amounts) as arrays.
+    """
+    df = pd.read_csv(path, usecols=FEATURES + ['loan_status'], low_memory=False).dropna()
+    y = df['loan_status'].isin(RISKY_STATUSES).astype(int)
+    _, X_test, _, y_test = train_test_split(df[FEATURES], y, test_size=0.2, random_state=42, stratify=y)
+
+    risk_model = joblib.load(model_path)
+    risk = risk_model.predict_proba(X_test)[:, 1]
+    return risk, y_test.to_numpy(), X_test['loan_amnt'].to_numpy(dtype=float)
+
+def build_sweep(risk, is_risky, loan_amounts):
+    """
+    Sorts the scores once and stores cumulative sums over them, so the outcome
+    of any threshold is a binary search away.
+
+    Scores are rounded up to SCORE_RESOLUTION first, which keeps the sweep at
+    a few thousand entries however many loans were scored, and stays exact for
+    thresholds that are multiples of the resolution.
+    """
+    buckets = np.ceil(risk / SCORE_RESOLUTION).astype(np.int64)
+    scores, inverse = np.unique(buckets, return_inverse=True)
+
+    def bucket_sum(values):
+        return np.bincount(inverse, weights=values, minlength=len(scores))
+
+    return {
+        'score_buckets': scores,
+        'loans': np.cumsum(bucket_sum(np.ones_like(risk))),
+        'risky': np.cumsum(bucket_sum(is_risky.astype(float))),
+        'risk_sum': np.cumsum(bucket_sum(risk)),
+        'amount': np.cumsum(bucket_sum(loan_amounts)),
+        'risky_amount': np.cumsum(bucket_sum(loan_amounts * is_risky)),
+        'expected_loss': np.cumsum(bucket_sum(risk * loan_amounts * LOSS_GIVEN_DEFAULT)),
+        'brier_score': np.array(np.mean((risk - is_risky) ** 2)),
+    }
+
+def save_sweep(sweep, path=SWEEP_FILE_PATH):
+    np.savez_compressed(path, **sweep)
+
+def load_sweep(path=SWEEP_FILE_PATH):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+def _cumulative_at(sweep, key, thresholds):
+    """Sum of a measure over every loan scoring at or below each threshold."""
+    # Compare in whole buckets; the small offset absorbs float error on exact multiples
+    buckets = np.floor(np.asarray(thresholds) / SCORE_RESOLUTION + 1e-6)
+    positions = np.searchsorted(sweep['score_buckets'], buckets, side='right')
+    padded = np.concatenate([[0.0], sweep[key]])
+    return padded[positions]
+
+def evaluate_thresholds(sweep, reject_threshold=REJECT_THRESHOLD, conditional_threshold=CONDITIONAL_THRESHOLD):
+    """
+    Computes decision mix, confusion matrix and losses for one threshold pair.
+
+    As in make_decision, loans scoring above reject_threshold are rejected and
+    those above conditional_threshold are approved with conditions. Rejected
+    loans count as 'Predicted Risky' in the confusion matrix. Works on scalars
+    or on equally shaped arrays of thresholds.
+    """
+    reject_threshold = np.asarray(reject_threshold, dtype=float)
+    conditional_threshold = np.minimum(np.asarray(conditional_threshold, dtype=float), reject_threshold)
+
+    total = sweep['loans'][-1]
+    total_risky = sweep['risky'][-1]
+    accepted = _cumulative_at(sweep, 'loans', reject_threshold)
+    approved = _cumulative_at(sweep, 'loans', conditional_threshold)
+    accepted_risky = _cumulative_at(sweep, 'risky', reject_threshold)
+
+    return {
+        'reject_threshold': reject_threshold,
+        'conditional_threshold': conditional_threshold,
+        'approved_rate': approved / total,
+        'conditional_rate': (accepted - approved) / total,
+        'rejected_rate': (total - accepted) / total,
+        'true_negatives': accepted - accepted_risky,
+        'false_negatives': accepted_risky,
+        'false_positives': (total - accepted) - (total_risky - accepted_risky),
+        'true_positives': total_risky - accepted_risky,
+        'expected_loss': _cumulative_at(sweep, 'expected_loss', reject_threshold),
+        'realized_loss': _cumulative_at(sweep, 'risky_amount', reject_threshold) * LOSS_GIVEN_DEFAULT,
+        'accepted_amount': _cumulative_at(sweep, 'amount', reject_threshold),
+    }
+
+def threshold_grid_report(sweep, step=0.01):
+    """Evaluates every threshold pair on a grid, with conditional <= reject, in one vectorized call."""
+    grid = np.round(np.arange(step, 1.0, step), 6)
+    reject, conditional = np.meshgrid(grid, grid, indexing='ij')
+    keep = conditional <= reject
+    return pd.DataFrame(evaluate_thresholds(sweep, reject[keep], conditional[keep]))
+
+def calibration_report(sweep, n_bins=10):
+    """Compares the mean predicted risk with the observed default rate in equal-width score bins."""
+    edges = np.linspace(0, 1, n_bins + 1)
+    # Bins are right-closed, matching the '> threshold' rule used for decisions
+    loans = np.diff(_cumulative_at(sweep, 'loans', edges))
+    risky = np.diff(_cumulative_at(sweep, 'risky', edges))
+    risk_sum = np.diff(_cumulative_at(sweep, 'risk_sum', edges))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'bin_low': edges[:-1],
+            'bin_high': edges[1:],
+            'loans': loans.astype(int),
+            'mean_predicted_risk': risk_sum / loans,
+            'observed_default_rate': risky / loans,
+        })
+
+if __name__ == "__main__":
+    print("➡️  Scoring the holdout set...")
+    try:
+        start_time = time.perf_counter()
+        risk, is_risky, loan_amounts = score_holdout()
+        print(f"✅ Scored {len(risk):,} holdout loans in {time.perf_counter() - start_time:.2f}s.")
+    except FileNotFoundError as e:
+        print(f"🔴 ERROR: A required file was not found: {e}")
+        exit()
+
+    start_time = time.perf_counter()
+    sweep = build_sweep(risk, is_risky, loan_amounts)
+    save_sweep(sweep)
+    grid = threshold_grid_report(sweep)
+    grid.to_csv(THRESHOLD_REPORT_PATH, index=False)
+    calibration = calibration_report(sweep)
+    calibration.to_csv(CALIBRATION_REPORT_PATH, index=False)
+    print(f"✅ Evaluated {len(grid):,} threshold pairs in {time.perf_counter() - start_time:.2f}s.")
+    print(f"✅ Sweep saved to '{SWEEP_FILE_PATH}', reports to '{THRESHOLD_REPORT_PATH}' and '{CALIBRATION_REPORT_PATH}'.")
+
+    current = evaluate_thresholds(sweep)
+    print(f"\n--- Current thresholds (reject > {REJECT_THRESHOLD}, conditions > {CONDITIONAL_THRESHOLD}) ---")
+    print(f"Approved: {current['approved_rate']:.2%}  With conditions: {current['conditional_rate']:.2%}  "
+          f"Rejected: {current['rejected_rate']:.2%}")
+    print(f"Expected loss on accepted loans: ${current['expected_loss']:,.0f}  "
+          f"Realized: ${current['realized_loss']:,.0f}")
+    print(pd.DataFrame([[current['true_negatives'], current['false_positives']],
+                        [current['false_negatives'], current['true_positives']]],
+                       columns=['Predicted Good', 'Predicted Risky'],
+                       index=['Actual Good', 'Actual Risky']).astype(int))
+
+    print(f"\n--- Calibration (Brier score: {float(sweep['brier_score']):.4f}) ---")
+    print(calibration.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
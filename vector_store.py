@@ -0,0 +1,21 @@
+import os
+from langchain_community.vectorstores import FAISS
+from quantized_vector_db import FLOAT_INDEX_PATH, QUANTIZED_INDEX_PATHS, load_quantized_index, quantized_retriever
+from sharded_vector_db import load_shards, sharded_retriever
+
+# Which index the RAG chain searches: 'float', 'int8', 'binary' or 'sharded'
+VECTOR_STORE = os.environ.get("VECTOR_STORE", "float")
+
+def load_retriever(embedding_model, mode=VECTOR_STORE, executor=None):
+    """
+    Loads the index selected by mode and returns it as a retriever for the RAG chain.
+    executor is only used by the sharded store, to search its shards in parallel.
+    """
+    if mode == 'float':
+        vector_db = FAISS.load_local(FLOAT_INDEX_PATH, embedding_model, allow_dangerous_deserialization=True)
+        return vector_db.as_retriever()
+    if mode in QUANTIZED_INDEX_PATHS:
+        return quantized_retriever(load_quantized_index(QUANTIZED_INDEX_PATHS[mode]), embedding_model)
+    if mode == 'sharded':
+        return sharded_retriever(load_shards(embedding_model), embedding_model, executor=executor)
+    raise ValueError(f"Unknown vector store: {mode}")
@@ -0,0 +1,211 @@
+import json
+import time
+import random
+import asyncio
+import joblib
+import numpy as np
+import pandas as pd
+from risk_assessment_model import FEATURES
+from decision_rules import DECISION_REASONS, score_and_decide
+from loan_processor import compute_emi, build_rejection_report
+from counterfactuals import compute_counterfactuals, format_recommendation
+
+QUEUE_FILE = "applicant_queue.txt"
+OUTPUT_FILE = "workflow_results.jsonl"
+
+# Number of concurrent workers per stage. The bureau call is I/O bound, so it
+# gets many workers; scoring is CPU bound and runs as a single micro-batcher.
+STAGE_WORKERS = {
+    'extract': 2,
+    'credit_history': 64,
+    'finalize': 2,
+}
+# Bounded queues between stages: a full queue blocks the stage feeding it
+QUEUE_SIZE = 256
+SCORING_BATCH_SIZE = 128
+SCORING_BATCH_WAIT = 0.02  # seconds to wait for a micro-batch to fill up
+
+# Latency of the simulated credit bureau, in seconds
+BUREAU_LATENCY = 0.2
+BUREAU_JITTER = 0.1
+
+async def simulated_bureau_lookup(applicant_details, latency=BUREAU_LATENCY, jitter=BUREAU_JITTER):
+    """Simulates a network call to a credit bureau, returning what fetch_credit_history returns."""
+    await asyncio.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+    return {
+        'fico_score': applicant_details.get('fico_range_low'),
+        'loan_status_history': applicant_details.get('loan_status')
+    }
+
+def read_applicant_ids(path):
+    """Reads one applicant ID per line, skipping blanks and comments."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [int(line.strip()) for line in f if line.strip() and not line.startswith('#')]
+
+def _to_json_value(value):
+    """Converts numpy scalars and NaN into plain JSON values."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+async def _extract_worker(in_queue, out_queue, results_queue, loan_df, row_for_id):
+    """Agent 1: looks each applicant up through the ID index instead of scanning the DataFrame."""
+    while True:
+        record = await in_queue.get()
+        row = row_for_id.get(record['id'])
+        if row is None:
+            record.update(decision='Error', reason='Applicant ID not found')
+            await results_queue.put(record)
+        else:
+            record['details'] = loan_df.iloc[row].to_dict()
+            await out_queue.put(record)
+        in_queue.task_done()
+
+async def _credit_history_worker(in_queue, out_queue):
+    """Agent 2: many of these overlap their bureau calls."""
+    while True:
+        record = await in_queue.get()
+        record['credit_history'] = await simulated_bureau_lookup(record['details'])
+        await out_queue.put(record)
+        in_queue.task_done()
+
+def _score_batch(risk_model, records):
+    """Agents 3 and 4 for a whole micro-batch: one predict_proba call, vectorized decisions."""
+    features = pd.DataFrame([record['details'] for record in records])[FEATURES]
+    risk, decisions, scorable = score_and_decide(features, risk_model)
+    counterfactuals = compute_counterfactuals(features.fillna(0), risk_model).to_dict('records')
+
+    for record, probability, decision, ok, counterfactual in zip(records, risk, decisions, scorable, counterfactuals):
+        if ok:
+            record.update(risk_probability=float(probability), decision=str(decision), reason=DECISION_REASONS[decision])
+            if decision == 'Rejected':
+                record['recommendation'] = format_recommendation(record['details'], counterfactual)
+        else:
+            record.update(risk_probability=None, decision='Error', reason='Missing features for risk assessment')
+
+async def _scoring_batcher(in_queue, out_queue, risk_model):
+    """Collects records into micro-batches and scores them off the event loop."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await in_queue.get()]
+        deadline = loop.time() + SCORING_BATCH_WAIT
+        while len(batch) < SCORING_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(in_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        await loop.run_in_executor(None, _score_batch, risk_model, batch)
+        for record in batch:
+            await out_queue.put(record)
+            in_queue.task_done()
+
+async def _finalize_worker(in_queue, results_queue):
+    """Agents 5 and 6: EMI for approved applicants, a report for rejected ones."""
+    while True:
+        record = await in_queue.get()
+        if record['decision'].startswith('Approved'):
+            try:
+                record['emi'], _ = compute_emi(record['details'])
+            except Exception as e:
+                record['emi_error'] = str(e)
+        elif record['decision'] == 'Rejected':
+            record['rejection_report'] = build_rejection_report(record['details'], record['reason'], record.get('recommendation'))
+        await results_queue.put(record)
+        in_queue.task_done()
+
+async def _result_writer(results_queue, output_file):
+    """Writes one JSON line per finished applicant as soon as it completes."""
+    while True:
+        record = await results_queue.get()
+        details = record.pop('details', {})
+        record.pop('credit_history', None)
+        record['fico_score'] = details.get('fico_range_low')
+        record['elapsed_seconds'] = time.perf_counter() - record.pop('started')
+        output_file.write(json.dumps({key: _to_json_value(value) for key, value in record.items()}) + "\n")
+        results_queue.task_done()
+
+async def run_workflow(applicant_ids, loan_df, risk_model, output_path=OUTPUT_FILE):
+    """
+    Runs the six-agent workflow over many applicants as a pipeline of stages.
+
+    Each stage has its own workers and hands records on through a bounded
+    queue, so while one applicant waits on the bureau others are being scored
+    or finalized. Returns the number of applicants processed.
+    """
+    row_for_id = {applicant_id: row for row, applicant_id in enumerate(loan_df['id'].to_numpy())}
+
+    extract_queue = asyncio.Queue(QUEUE_SIZE)
+    credit_queue = asyncio.Queue(QUEUE_SIZE)
+    scoring_queue = asyncio.Queue(QUEUE_SIZE)
+    finalize_queue = asyncio.Queue(QUEUE_SIZE)
+    results_queue = asyncio.Queue(QUEUE_SIZE)
+
+    with open(output_path, 'w', encoding='utf-8') as output_file:
+        stages = [
+            (extract_queue, [_extract_worker(extract_queue, credit_queue, results_queue, loan_df, row_for_id)
+                             for _ in range(STAGE_WORKERS['extract'])]),
+            (credit_queue, [_credit_history_worker(credit_queue, scoring_queue)
+                            for _ in range(STAGE_WORKERS['credit_history'])]),
+            (scoring_queue, [_scoring_batcher(scoring_queue, finalize_queue, risk_model)]),
+            (finalize_queue, [_finalize_worker(finalize_queue, results_queue)
+                              for _ in range(STAGE_WORKERS['finalize'])]),
+            (results_queue, [_result_writer(results_queue, output_file)]),
+        ]
+        tasks = [asyncio.create_task(worker) for _, workers in stages for worker in workers]
+
+        async def feed_and_drain():
+            # Feeding blocks whenever the first queue is full, which is the backpressure
+            for applicant_id in applicant_ids:
+                await extract_queue.put({'id': applicant_id, 'started': time.perf_counter()})
+
+            # Drain the stages in order; once a queue is empty nothing upstream can refill it
+            for stage_queue, _ in stages:
+                await stage_queue.join()
+
+        # Workers loop forever, so one finishing means it crashed; its records would
+        # never be marked done and the joins would hang, so stop and re-raise instead
+        drain_task = asyncio.create_task(feed_and_drain())
+        done, _ = await asyncio.wait([drain_task] + tasks, return_when=asyncio.FIRST_COMPLETED)
+
+        for task in tasks + [drain_task]:
+            task.cancel()
+        await asyncio.gather(*tasks, drain_task, return_exceptions=True)
+
+        for task in done:
+            if task is not drain_task or task.exception() is not None:
+                raise task.exception() or RuntimeError("A workflow stage stopped unexpectedly")
+
+    return len(applicant_ids)
+
+if __name__ == "__main__":
+    print("--- Starting Concurrent Loan Application Processing ---")
+
+    try:
+        applicant_ids = read_applicant_ids(QUEUE_FILE)
+        loan_df = pd.read_csv("dataset/loan.csv", low_memory=False)
+        risk_model = joblib.load("risk_model.joblib")
+
+        loan_df['id'] = pd.to_numeric(loan_df['id'], errors='coerce')
+        loan_df.dropna(subset=['id'], inplace=True)
+        loan_df['id'] = loan_df['id'].astype(int)
+        print(f"✅ Models and data loaded; {len(applicant_ids):,} applicants queued from '{QUEUE_FILE}'.")
+    except FileNotFoundError as e:
+        print(f"🔴 CRITICAL ERROR: A required file was not found: {e}")
+        exit()
+
+    start_time = time.perf_counter()
+    try:
+        processed = asyncio.run(run_workflow(applicant_ids, loan_df, risk_model))
+    except Exception as e:
+        print(f"🔴 The workflow stopped because a stage failed: {e!r}")
+        exit(1)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"✅ Processed {processed:,} applicants in {elapsed:.2f}s ({processed / elapsed:,.1f} applicants/s).")
+    print(f"✅ Results written to '{OUTPUT_FILE}'.")